@@ -7,15 +7,48 @@ remains responsive on mobile devices.
 
 from __future__ import annotations
 
-import base64
+import asyncio
+import hashlib
 import json
+import mmap
+import os
 from pathlib import Path
-from typing import Any, Dict
+from typing import TYPE_CHECKING, Any, Dict, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - optional async client
+    httpx = None
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional accelerator
+    orjson = None
+
+try:
+    # Vectorized base64 (SIMD-accelerated); drop-in replacement for the stdlib
+    # encoder when the wheel is available for the target platform.
+    import pybase64 as _base64
+except ImportError:  # pragma: no cover - optional accelerator
+    import base64 as _base64
 
 from .config import settings
 
+if TYPE_CHECKING:
+    from .database import Database
+
+
+def _loads(data: str | bytes) -> Any:
+    """Parse JSON with orjson when available; raises ValueError on bad input."""
+
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
 MOCK_RESPONSE: dict[str, Any] = {
     "description": "[DEV] A placeholder description of a cat.",
     "tags": ["test", "cat", "1girl", "indoors"],
@@ -26,8 +59,23 @@ MOCK_RESPONSE: dict[str, Any] = {
 class AIEngine:
     """Encapsulates AI calls and mock fallbacks."""
 
-    def __init__(self, use_real_ai: bool | None = None) -> None:
+    def __init__(
+        self,
+        use_real_ai: bool | None = None,
+        database: "Database | None" = None,
+    ) -> None:
         self.use_real_ai = settings.use_real_ai if use_real_ai is None else use_real_ai
+        self.database = database
+        # Analyses keyed by (path, size, mtime_ns) so re-adding an unchanged
+        # file skips the read, encode, and HTTP round-trip entirely.
+        self._memory_cache: dict[Tuple[str, int, int], Dict[str, Any]] = {}
+        # One keep-alive session for the whole engine so batch imports reuse a
+        # single TCP connection instead of paying a handshake per image.
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=0)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        self._async_client: "httpx.AsyncClient | None" = None
 
     def analyze_image(self, image_path: Path) -> Dict[str, Any]:
         """Return analysis data for an image path.
@@ -41,32 +89,197 @@ class AIEngine:
             return MOCK_RESPONSE
 
         try:
-            encoded = self._encode_image(image_path)
+            cache_key, digest, cached = self._lookup_cache(image_path)
         except OSError:
             return {**MOCK_RESPONSE, "description": "[DEV] Unable to read image."}
-
-        payload = {
-            "model": "joy-caption-alpha-two",
-            "prompt": settings.system_prompt,
-            "stream": False,
-            "options": {"temperature": 0.2},
-            "input": {"image": encoded},
-        }
+        if cached is not None:
+            return cached
 
         try:
-            response = requests.post(settings.ollama_api_url, json=payload, timeout=30)
+            response = self._request_analysis(image_path)
             response.raise_for_status()
-            data = response.json()
+            data = _loads(response.content)
             parsed = self._parse_ai_response(data)
+            if parsed:
+                self._store_cache(cache_key, digest, parsed)
             return parsed or MOCK_RESPONSE
         except requests.RequestException:
             return {**MOCK_RESPONSE, "description": "[DEV] AI service unreachable."}
-        except (json.JSONDecodeError, KeyError, TypeError):
+        except OSError:
+            return {**MOCK_RESPONSE, "description": "[DEV] Unable to read image."}
+        except (ValueError, KeyError, TypeError):
+            return {**MOCK_RESPONSE, "description": "[DEV] Unexpected AI response."}
+
+    def _request_analysis(self, image_path: Path) -> requests.Response:
+        """POST the image to the Ollama endpoint and return the raw response.
+
+        When multipart upload is enabled the raw bytes are streamed directly,
+        skipping the base64 pass entirely and sending a third fewer bytes.
+        Otherwise the image is base64-encoded into the JSON payload.
+        """
+
+        if settings.ollama_multipart:
+            data = {
+                "model": "joy-caption-alpha-two",
+                "prompt": settings.system_prompt,
+                "stream": "false",
+            }
+            with image_path.open("rb") as image_file:
+                return self._session.post(
+                    settings.ollama_api_url,
+                    data=data,
+                    files={"image": image_file},
+                    timeout=30,
+                )
+
+        payload = self._json_payload(self._encode_image(image_path))
+        return self._session.post(settings.ollama_api_url, json=payload, timeout=30)
+
+    async def analyze_image_async(self, image_path: Path) -> Dict[str, Any]:
+        """Async variant of :meth:`analyze_image` for concurrent batches.
+
+        Concurrent calls share one ``httpx.AsyncClient``; with HTTP/2 they
+        multiplex over a single connection instead of opening one socket per
+        request. Without httpx the sync path runs on a worker thread so the
+        event loop stays free either way.
+        """
+
+        if not self.use_real_ai:
+            return MOCK_RESPONSE
+
+        if httpx is None:
+            return await asyncio.to_thread(self.analyze_image, image_path)
+
+        multipart = settings.ollama_multipart
+        try:
+            cache_key, digest, cached = await asyncio.to_thread(
+                self._lookup_cache, image_path
+            )
+            if cached is not None:
+                return cached
+            # Multipart sends the raw bytes and skips the base64 pass, same
+            # as the sync path in _request_analysis.
+            if multipart:
+                body = await asyncio.to_thread(image_path.read_bytes)
+            else:
+                body = await asyncio.to_thread(self._encode_image, image_path)
+        except OSError:
+            return {**MOCK_RESPONSE, "description": "[DEV] Unable to read image."}
+
+        try:
+            client = self._get_async_client()
+            if multipart:
+                response = await client.post(
+                    settings.ollama_api_url,
+                    data={
+                        "model": "joy-caption-alpha-two",
+                        "prompt": settings.system_prompt,
+                        "stream": "false",
+                    },
+                    files={"image": body},
+                )
+            else:
+                response = await client.post(
+                    settings.ollama_api_url, json=self._json_payload(body)
+                )
+            response.raise_for_status()
+            raw = response.content
+        except httpx.HTTPError:
+            return {**MOCK_RESPONSE, "description": "[DEV] AI service unreachable."}
+
+        try:
+            parsed = self._parse_ai_response(_loads(raw))
+            if parsed:
+                self._store_cache(cache_key, digest, parsed)
+            return parsed or MOCK_RESPONSE
+        except (ValueError, KeyError, TypeError):
             return {**MOCK_RESPONSE, "description": "[DEV] Unexpected AI response."}
 
+    def _get_async_client(self) -> "httpx.AsyncClient":
+        if self._async_client is None:
+            try:
+                self._async_client = httpx.AsyncClient(http2=True, timeout=30)
+            except ImportError:  # the http2 extra (h2) is not installed
+                self._async_client = httpx.AsyncClient(timeout=30)
+        return self._async_client
+
+    async def aclose(self) -> None:
+        """Release the async HTTP client, if one was created."""
+
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+
+    def _lookup_cache(
+        self, image_path: Path
+    ) -> Tuple[Tuple[str, int, int], str | None, Dict[str, Any] | None]:
+        """Return (cache key, content digest, cached analysis or None).
+
+        The in-memory lookup costs one stat; only on a miss is the file
+        hashed to consult the persistent cache, which survives restarts and
+        covers the same content under a different path.
+        """
+
+        stat = image_path.stat()
+        cache_key = (str(image_path), stat.st_size, stat.st_mtime_ns)
+        cached = self._memory_cache.get(cache_key)
+        if cached is not None:
+            return cache_key, None, cached
+
+        digest = self._digest(image_path)
+        cached = (
+            self.database.get_cached_analysis(digest) if self.database else None
+        )
+        if cached is not None:
+            self._remember(cache_key, cached)
+        return cache_key, digest, cached
+
+    def _store_cache(
+        self,
+        cache_key: Tuple[str, int, int],
+        digest: str | None,
+        analysis: Dict[str, Any],
+    ) -> None:
+        self._remember(cache_key, analysis)
+        if self.database is not None and digest:
+            self.database.store_cached_analysis(digest, analysis)
+
+    def _remember(
+        self, cache_key: Tuple[str, int, int], analysis: Dict[str, Any]
+    ) -> None:
+        if len(self._memory_cache) >= 256:
+            self._memory_cache.pop(next(iter(self._memory_cache)))
+        self._memory_cache[cache_key] = analysis
+
+    @staticmethod
+    def _digest(image_path: Path) -> str:
+        hasher = hashlib.blake2b(digest_size=16)
+        with open(image_path, "rb") as image_file:
+            for chunk in iter(lambda: image_file.read(1 << 16), b""):
+                hasher.update(chunk)
+        return hasher.hexdigest()
+
+    def _json_payload(self, encoded: str) -> Dict[str, Any]:
+        return {
+            "model": "joy-caption-alpha-two",
+            "prompt": settings.system_prompt,
+            "stream": False,
+            "options": {"temperature": 0.2},
+            "input": {"image": encoded},
+        }
+
     def _encode_image(self, image_path: Path) -> str:
-        content = image_path.read_bytes()
-        return base64.b64encode(content).decode("utf-8")
+        # Memory-map the file so the encoder reads straight from the page
+        # cache instead of an intermediate bytes copy; peak allocation drops
+        # from ~2.3x to ~1.3x the file size, which matters for large photos.
+        with open(image_path, "rb") as image_file:
+            if os.fstat(image_file.fileno()).st_size == 0:
+                return ""
+            with mmap.mmap(
+                image_file.fileno(), 0, access=mmap.ACCESS_READ
+            ) as mapped:
+                # Base64 output is guaranteed ASCII, so skip the UTF-8 decoder.
+                return _base64.b64encode(mapped).decode("ascii")
 
     def _parse_ai_response(self, response_data: Dict[str, Any]) -> Dict[str, Any] | None:
         """Extract structured data from the Ollama JSON response."""
@@ -79,7 +292,7 @@ class AIEngine:
             return None
 
         try:
-            parsed = json.loads(text)
+            parsed = _loads(text)
             description = parsed.get("description") or parsed.get("caption")
             tags = parsed.get("tags") or []
             return {
@@ -87,5 +300,5 @@ class AIEngine:
                 "tags": tags if isinstance(tags, list) else MOCK_RESPONSE["tags"],
                 "nsfw": bool(parsed.get("nsfw", False)),
             }
-        except json.JSONDecodeError:
+        except ValueError:
             return None
@@ -26,6 +26,15 @@ class Settings(BaseSettings):
             "to use http://10.0.2.2:11434."
         ),
     )
+    ollama_multipart: bool = Field(
+        False,
+        alias="OLLAMA_MULTIPART",
+        description=(
+            "POST the raw image as multipart/form-data instead of base64 inside "
+            "JSON. Enable only if the endpoint accepts binary uploads; it skips "
+            "the encode pass and sends a third fewer bytes."
+        ),
+    )
     system_prompt: str = Field(
         (
             "You are Joy-Caption running on-device. Given an image, return a concise "
@@ -42,6 +51,14 @@ class Settings(BaseSettings):
             "if it does not exist."
         ),
     )
+    thumbnail_dir: Path = Field(
+        default_factory=lambda: Path.home() / "SmartGallery" / "thumbnails",
+        alias="THUMBNAIL_DIR",
+        description=(
+            "Cache folder for generated gallery thumbnails. The directory is "
+            "created if it does not exist."
+        ),
+    )
     db_path: Path = Field(
         default_factory=lambda: Path.home() / "SmartGallery" / "smart_gallery.db",
         alias="DB_PATH",
@@ -53,4 +70,5 @@ class Settings(BaseSettings):
 
 settings = Settings()
 settings.gallery_dir.mkdir(parents=True, exist_ok=True)
+settings.thumbnail_dir.mkdir(parents=True, exist_ok=True)
 settings.db_path.parent.mkdir(parents=True, exist_ok=True)
@@ -6,9 +6,12 @@ managers to keep connections short-lived. Tables are created on first use.
 
 from __future__ import annotations
 
+import json
 import sqlite3
+import threading
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Iterable, List, Sequence
+from typing import Iterable, Iterator, List, Sequence
 
 from .config import settings
 
@@ -18,23 +21,65 @@ class Database:
 
     def __init__(self, db_path: Path | None = None) -> None:
         self.db_path = db_path or settings.db_path
+        self._fts_enabled = False
+        self._conn: sqlite3.Connection | None = None
+        # Serializes every statement block on the shared connection; callers
+        # on the UI loop, debounce timers, and the ingest pool all go
+        # through _locked_conn.
+        self._lock = threading.Lock()
         self._ensure_db()
 
     def _connect(self) -> sqlite3.Connection:
-        connection = sqlite3.connect(self.db_path)
-        connection.row_factory = sqlite3.Row
-        connection.execute("PRAGMA foreign_keys = ON;")
-        return connection
+        """Return the shared connection, opening it on first use.
+
+        Opening the file and replaying pragmas per query dominates the cost
+        of the small statements the UI issues, so one long-lived connection
+        is kept for the process. Used as a context manager it still commits
+        per block without closing.
+        """
+
+        if self._conn is None:
+            connection = sqlite3.connect(self.db_path, check_same_thread=False)
+            connection.row_factory = sqlite3.Row
+            connection.execute("PRAGMA foreign_keys = ON;")
+            connection.execute("PRAGMA synchronous = NORMAL;")
+            connection.execute("PRAGMA temp_store = MEMORY;")
+            self._conn = connection
+        return self._conn
+
+    @contextmanager
+    def _locked_conn(self) -> Iterator[sqlite3.Connection]:
+        """Yield the shared connection with exclusive access.
+
+        ``sqlite3``'s context manager commits on exit, so an unlocked reader
+        finishing mid-way through another thread's multi-statement write
+        would commit that thread's partial transaction. One lock around
+        every block keeps each ``with`` a real transaction across the UI
+        loop, debounce timers, and ingest workers.
+        """
+
+        with self._lock:
+            with self._connect() as conn:
+                yield conn
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
 
     def _ensure_db(self) -> None:
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
-        with self._connect() as conn:
+        with self._locked_conn() as conn:
+            # WAL avoids a full fsync per commit and is sticky on the file.
+            conn.execute("PRAGMA journal_mode = WAL;")
             conn.executescript(
                 """
                 CREATE TABLE IF NOT EXISTS images (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     path TEXT UNIQUE NOT NULL,
                     description TEXT DEFAULT '',
+                    thumb_path TEXT DEFAULT '',
                     processed_flag INTEGER DEFAULT 0,
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                 );
@@ -51,34 +96,127 @@ class Database:
                     FOREIGN KEY (image_id) REFERENCES images(id) ON DELETE CASCADE,
                     FOREIGN KEY (tag_id) REFERENCES tags(id) ON DELETE CASCADE
                 );
+
+                CREATE TABLE IF NOT EXISTS ai_cache (
+                    digest TEXT PRIMARY KEY,
+                    description TEXT DEFAULT '',
+                    tags TEXT DEFAULT '[]',
+                    nsfw INTEGER DEFAULT 0,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                );
+
+                CREATE INDEX IF NOT EXISTS idx_images_created
+                    ON images(created_at DESC);
+                CREATE INDEX IF NOT EXISTS idx_tags_name
+                    ON tags(name COLLATE NOCASE);
                 """
             )
+            try:
+                conn.execute("ALTER TABLE images ADD COLUMN thumb_path TEXT DEFAULT '';")
+            except sqlite3.OperationalError:
+                pass  # column already exists
+            try:
+                # Full-text search over descriptions and tag names; rowids are
+                # image ids. Optional because some SQLite builds omit FTS5.
+                conn.execute(
+                    "CREATE VIRTUAL TABLE IF NOT EXISTS images_fts "
+                    "USING fts5(description, tags);"
+                )
+                self._fts_enabled = True
+            except sqlite3.OperationalError:
+                self._fts_enabled = False
+
+            if self._fts_enabled:
+                self._backfill_fts(conn)
+
+    def _backfill_fts(self, conn: sqlite3.Connection) -> None:
+        """Index existing rows when the FTS table is newly created.
+
+        Databases written before the FTS table existed (or by SQLite builds
+        without FTS5) otherwise come up with an empty index and previously
+        ingested images never match a search.
+        """
+
+        fts_count = conn.execute("SELECT count(*) FROM images_fts;").fetchone()[0]
+        if fts_count:
+            return
+
+        conn.execute(
+            """
+            INSERT INTO images_fts (rowid, description, tags)
+            SELECT i.id, COALESCE(i.description, ''),
+                   COALESCE(GROUP_CONCAT(t.name, ' '), '')
+            FROM images i
+            LEFT JOIN image_tags it ON it.image_id = i.id
+            LEFT JOIN tags t ON t.id = it.tag_id
+            GROUP BY i.id;
+            """
+        )
 
     def add_image(
         self, path: Path, description: str = "", processed_flag: bool = False
     ) -> int:
         """Insert an image row or return the existing id if already stored."""
 
-        with self._connect() as conn:
-            cursor = conn.execute(
-                """
-                INSERT OR IGNORE INTO images (path, description, processed_flag)
-                VALUES (?, ?, ?);
-                """,
-                (str(path), description, int(processed_flag)),
-            )
-            if cursor.lastrowid:
-                return int(cursor.lastrowid)
+        with self._locked_conn() as conn:
+            return self._insert_image(conn, path, description, processed_flag)
 
-            existing = conn.execute(
-                "SELECT id FROM images WHERE path = ?;", (str(path),)
-            ).fetchone()
-            return int(existing["id"]) if existing else 0
+    def _insert_image(
+        self,
+        conn: sqlite3.Connection,
+        path: Path,
+        description: str = "",
+        processed_flag: bool = False,
+    ) -> int:
+        cursor = conn.execute(
+            """
+            INSERT OR IGNORE INTO images (path, description, processed_flag)
+            VALUES (?, ?, ?);
+            """,
+            (str(path), description, int(processed_flag)),
+        )
+        # lastrowid is stale after an ignored insert, so gate on rowcount.
+        if cursor.rowcount:
+            return int(cursor.lastrowid)
+
+        existing = conn.execute(
+            "SELECT id FROM images WHERE path = ?;", (str(path),)
+        ).fetchone()
+        return int(existing["id"]) if existing else 0
+
+    def bulk_ingest(
+        self, items: Sequence[tuple[Path, str, Sequence[str], str]]
+    ) -> List[int]:
+        """Store a batch of analyzed images in a single transaction.
+
+        Each item is a ``(path, description, tags, thumb_path)`` tuple. One
+        commit (and therefore one fsync) covers the whole batch instead of
+        four per file, which is the dominant write cost on mobile flash.
+        """
+
+        image_ids: list[int] = []
+        with self._locked_conn() as conn:
+            for path, description, tags, thumb_path in items:
+                image_id = self._insert_image(conn, path, processed_flag=True)
+                conn.execute(
+                    """
+                    UPDATE images
+                    SET description = ?, thumb_path = ?, processed_flag = 1
+                    WHERE id = ?;
+                    """,
+                    (description, thumb_path, image_id),
+                )
+                cleaned_names = [name.strip() for name in tags if name.strip()]
+                tag_ids = self._upsert_tags(conn, cleaned_names)
+                self._link_tags(conn, image_id, tag_ids)
+                self._sync_fts(conn, image_id)
+                image_ids.append(image_id)
+        return image_ids
 
     def update_image_metadata(
         self, image_id: int, description: str, processed_flag: bool = True
     ) -> None:
-        with self._connect() as conn:
+        with self._locked_conn() as conn:
             conn.execute(
                 """
                 UPDATE images
@@ -87,6 +225,27 @@ class Database:
                 """,
                 (description, int(processed_flag), image_id),
             )
+            self._sync_fts(conn, image_id)
+
+    def save_image_metadata(
+        self, image_id: int, description: str, tags: Sequence[str]
+    ) -> None:
+        """Replace an image's description and tag set in one transaction.
+
+        Equivalent to update + clear + upsert + link, but with a single
+        commit and one FTS refresh instead of four.
+        """
+
+        cleaned_names = [name.strip() for name in tags if name.strip()]
+        with self._locked_conn() as conn:
+            conn.execute(
+                "UPDATE images SET description = ?, processed_flag = 1 WHERE id = ?;",
+                (description, image_id),
+            )
+            conn.execute("DELETE FROM image_tags WHERE image_id = ?;", (image_id,))
+            tag_ids = self._upsert_tags(conn, cleaned_names)
+            self._link_tags(conn, image_id, tag_ids)
+            self._sync_fts(conn, image_id)
 
     def upsert_tags(self, names: Sequence[str]) -> List[int]:
         """Ensure tags exist and return their ids."""
@@ -95,42 +254,81 @@ class Database:
         if not cleaned_names:
             return []
 
-        tag_ids: list[int] = []
-        with self._connect() as conn:
-            for name in cleaned_names:
-                cursor = conn.execute(
-                    "INSERT OR IGNORE INTO tags (name) VALUES (?);", (name,)
-                )
-                if cursor.lastrowid:
-                    tag_ids.append(int(cursor.lastrowid))
-                else:
-                    row = conn.execute(
-                        "SELECT id FROM tags WHERE name = ?;", (name,)
-                    ).fetchone()
-                    if row:
-                        tag_ids.append(int(row["id"]))
-        return tag_ids
+        with self._locked_conn() as conn:
+            return self._upsert_tags(conn, cleaned_names)
+
+    def _upsert_tags(
+        self, conn: sqlite3.Connection, cleaned_names: Sequence[str]
+    ) -> List[int]:
+        if not cleaned_names:
+            return []
+
+        conn.executemany(
+            "INSERT OR IGNORE INTO tags (name) VALUES (?);",
+            [(name,) for name in cleaned_names],
+        )
+        placeholders = ", ".join("?" * len(cleaned_names))
+        rows = conn.execute(
+            f"SELECT id, name FROM tags WHERE name IN ({placeholders});",
+            list(cleaned_names),
+        ).fetchall()
+
+        id_by_name = {row["name"]: int(row["id"]) for row in rows}
+        return [id_by_name[name] for name in cleaned_names if name in id_by_name]
 
     def link_tags_to_image(self, image_id: int, tag_ids: Iterable[int]) -> None:
+        with self._locked_conn() as conn:
+            self._link_tags(conn, image_id, tag_ids)
+            self._sync_fts(conn, image_id)
+
+    def _link_tags(
+        self, conn: sqlite3.Connection, image_id: int, tag_ids: Iterable[int]
+    ) -> None:
         ids = list(tag_ids)
         if not ids:
             return
 
-        with self._connect() as conn:
-            conn.executemany(
-                "INSERT OR IGNORE INTO image_tags (image_id, tag_id) VALUES (?, ?);",
-                [(image_id, tag_id) for tag_id in ids],
-            )
+        conn.executemany(
+            "INSERT OR IGNORE INTO image_tags (image_id, tag_id) VALUES (?, ?);",
+            [(image_id, tag_id) for tag_id in ids],
+        )
+
+    def _sync_fts(self, conn: sqlite3.Connection, image_id: int) -> None:
+        """Refresh the FTS row for an image after its text or tags change."""
+
+        if not self._fts_enabled:
+            return
+
+        row = conn.execute(
+            "SELECT description FROM images WHERE id = ?;", (image_id,)
+        ).fetchone()
+        conn.execute("DELETE FROM images_fts WHERE rowid = ?;", (image_id,))
+        if not row:
+            return
+
+        tag_rows = conn.execute(
+            """
+            SELECT t.name
+            FROM tags t
+            JOIN image_tags it ON it.tag_id = t.id
+            WHERE it.image_id = ?;
+            """,
+            (image_id,),
+        ).fetchall()
+        conn.execute(
+            "INSERT INTO images_fts (rowid, description, tags) VALUES (?, ?, ?);",
+            (image_id, row["description"] or "", " ".join(r["name"] for r in tag_rows)),
+        )
 
     def _normalize_sort_order(self, order: str) -> str:
         return "ASC" if order and order.lower().startswith("asc") else "DESC"
 
     def get_images(self, limit: int = 100, offset: int = 0, order: str = "desc") -> List[dict]:
         sort_order = self._normalize_sort_order(order)
-        with self._connect() as conn:
+        with self._locked_conn() as conn:
             rows = conn.execute(
                 f"""
-                SELECT id, path, description, processed_flag, created_at
+                SELECT id, path, thumb_path, description, processed_flag, created_at
                 FROM images
                 ORDER BY created_at {sort_order}
                 LIMIT ? OFFSET ?;
@@ -139,8 +337,42 @@ class Database:
             ).fetchall()
         return [dict(row) for row in rows]
 
+    def get_images_with_tags(
+        self, limit: int = 100, offset: int = 0, order: str = "desc"
+    ) -> List[dict]:
+        """Return image rows with a ``tags`` list aggregated in one query.
+
+        SQLite does the grouping in C via GROUP_CONCAT, so a page of rows
+        plus all its tags costs a single round-trip. char(31) (the unit
+        separator) keeps tag names containing commas intact.
+        """
+
+        sort_order = self._normalize_sort_order(order)
+        with self._locked_conn() as conn:
+            rows = conn.execute(
+                f"""
+                SELECT i.id, i.path, i.thumb_path, i.description, i.processed_flag,
+                       i.created_at, GROUP_CONCAT(t.name, char(31)) AS tag_names
+                FROM images i
+                LEFT JOIN image_tags it ON it.image_id = i.id
+                LEFT JOIN tags t ON t.id = it.tag_id
+                GROUP BY i.id
+                ORDER BY i.created_at {sort_order}
+                LIMIT ? OFFSET ?;
+                """,
+                (limit, offset),
+            ).fetchall()
+
+        images = []
+        for row in rows:
+            image = dict(row)
+            raw = image.pop("tag_names", None)
+            image["tags"] = sorted(raw.split("\x1f")) if raw else []
+            images.append(image)
+        return images
+
     def get_tags_for_image(self, image_id: int) -> List[str]:
-        with self._connect() as conn:
+        with self._locked_conn() as conn:
             rows = conn.execute(
                 """
                 SELECT t.name
@@ -153,17 +385,97 @@ class Database:
             ).fetchall()
         return [row["name"] for row in rows]
 
+    def get_processed_paths(self, paths: Sequence[Path]) -> set[str]:
+        """Return the subset of paths already stored with processed_flag set."""
+
+        path_strings = [str(path) for path in paths]
+        if not path_strings:
+            return set()
+
+        placeholders = ", ".join("?" * len(path_strings))
+        with self._locked_conn() as conn:
+            rows = conn.execute(
+                f"""
+                SELECT path FROM images
+                WHERE processed_flag = 1 AND path IN ({placeholders});
+                """,
+                path_strings,
+            ).fetchall()
+        return {row["path"] for row in rows}
+
+    def get_cached_analysis(self, digest: str) -> dict | None:
+        """Return a previously stored AI analysis for a content digest."""
+
+        with self._locked_conn() as conn:
+            row = conn.execute(
+                "SELECT description, tags, nsfw FROM ai_cache WHERE digest = ?;",
+                (digest,),
+            ).fetchone()
+        if not row:
+            return None
+
+        try:
+            tags = json.loads(row["tags"])
+        except json.JSONDecodeError:
+            tags = []
+        return {
+            "description": row["description"],
+            "tags": tags if isinstance(tags, list) else [],
+            "nsfw": bool(row["nsfw"]),
+        }
+
+    def store_cached_analysis(self, digest: str, analysis: dict) -> None:
+        with self._locked_conn() as conn:
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO ai_cache (digest, description, tags, nsfw)
+                VALUES (?, ?, ?, ?);
+                """,
+                (
+                    digest,
+                    analysis.get("description", ""),
+                    json.dumps(analysis.get("tags", [])),
+                    int(bool(analysis.get("nsfw", False))),
+                ),
+            )
+
+    def get_tags_for_images(self, image_ids: Sequence[int]) -> dict[int, List[str]]:
+        """Return tag names for many images in one query, keyed by image id."""
+
+        ids = [int(image_id) for image_id in image_ids]
+        if not ids:
+            return {}
+
+        placeholders = ", ".join("?" * len(ids))
+        with self._locked_conn() as conn:
+            rows = conn.execute(
+                f"""
+                SELECT it.image_id, t.name
+                FROM tags t
+                JOIN image_tags it ON it.tag_id = t.id
+                WHERE it.image_id IN ({placeholders})
+                ORDER BY t.name ASC;
+                """,
+                ids,
+            ).fetchall()
+
+        tags_by_id: dict[int, List[str]] = {}
+        for row in rows:
+            tags_by_id.setdefault(int(row["image_id"]), []).append(row["name"])
+        return tags_by_id
+
     def clear_tags(self, image_id: int) -> None:
         """Remove all tag associations for an image to allow overwriting."""
-        with self._connect() as conn:
+        with self._locked_conn() as conn:
             conn.execute("DELETE FROM image_tags WHERE image_id = ?;", (image_id,))
+            self._sync_fts(conn, image_id)
 
     def get_image_details(self, image_id: int) -> dict | None:
         """Return a single image row along with its tags."""
-        with self._connect() as conn:
+        with self._locked_conn() as conn:
             image_row = conn.execute(
                 """
-                SELECT id, path, description, processed_flag, created_at
+                SELECT id, path, thumb_path, description, processed_flag, created_at
                 FROM images
                 WHERE id = ?;
                 """,
@@ -190,13 +502,79 @@ class Database:
     def search_images(
         self, query: str, limit: int = 100, offset: int = 0, order: str = "desc"
     ) -> List[dict]:
-        """Search images by description or tag name using a LIKE pattern."""
-        pattern = f"%{query.strip()}%"
+        """Search images by description or tag name.
+
+        Uses the FTS5 index with prefix matching when available so the query
+        hits an index instead of scanning every row; falls back to the LIKE
+        scan on builds without FTS5 or for queries FTS cannot parse.
+        """
+
+        cleaned = query.strip()
         sort_order = self._normalize_sort_order(order)
-        with self._connect() as conn:
+
+        if self._fts_enabled and cleaned:
+            rows = self._search_fts(cleaned, limit, offset, sort_order)
+            if rows is not None:
+                return rows
+        return self._search_like(cleaned, limit, offset, sort_order)
+
+    def _search_fts(
+        self, query: str, limit: int, offset: int, sort_order: str
+    ) -> List[dict] | None:
+        match = " ".join(
+            '"{}"*'.format(token.replace('"', '""')) for token in query.split()
+        )
+        with self._locked_conn() as conn:
+            try:
+                rows = conn.execute(
+                    f"""
+                    SELECT i.id, i.path, i.thumb_path, i.description, i.processed_flag, i.created_at
+                    FROM images_fts
+                    JOIN images i ON i.id = images_fts.rowid
+                    WHERE images_fts MATCH ?
+                    ORDER BY i.created_at {sort_order}
+                    LIMIT ? OFFSET ?;
+                    """,
+                    (match, limit, offset),
+                ).fetchall()
+            except sqlite3.OperationalError:
+                return None
+        return [dict(row) for row in rows]
+
+    def _search_like(
+        self, query: str, limit: int, offset: int, sort_order: str
+    ) -> List[dict]:
+        # A leading-% LIKE can never use an index, but a single-word query is
+        # usually a tag name, and an exact case-insensitive match seeks the
+        # tag-name index instead of scanning every row. The strategy is
+        # decided by whether the tag exists, not by whether this page has
+        # rows, so every offset of one query pages the same result set.
+        if query and " " not in query:
+            with self._locked_conn() as conn:
+                tag_row = conn.execute(
+                    "SELECT id FROM tags WHERE name = ? COLLATE NOCASE LIMIT 1;",
+                    (query,),
+                ).fetchone()
+                if tag_row is not None:
+                    rows = conn.execute(
+                        f"""
+                        SELECT DISTINCT i.id, i.path, i.thumb_path, i.description, i.processed_flag, i.created_at
+                        FROM images i
+                        JOIN image_tags it ON i.id = it.image_id
+                        JOIN tags t ON t.id = it.tag_id
+                        WHERE t.name = ? COLLATE NOCASE
+                        ORDER BY i.created_at {sort_order}
+                        LIMIT ? OFFSET ?;
+                        """,
+                        (query, limit, offset),
+                    ).fetchall()
+                    return [dict(row) for row in rows]
+
+        pattern = f"%{query}%"
+        with self._locked_conn() as conn:
             rows = conn.execute(
                 f"""
-                SELECT DISTINCT i.id, i.path, i.description, i.processed_flag, i.created_at
+                SELECT DISTINCT i.id, i.path, i.thumb_path, i.description, i.processed_flag, i.created_at
                 FROM images i
                 LEFT JOIN image_tags it ON i.id = it.image_id
                 LEFT JOIN tags t ON t.id = it.tag_id
@@ -23,7 +23,7 @@ def main(page: ft.Page) -> None:
     page.vertical_alignment = ft.MainAxisAlignment.START
 
     database = Database()
-    ai_engine = AIEngine()
+    ai_engine = AIEngine(database=database)
 
     gallery_view = GalleryView(database=database, ai_engine=ai_engine)
 
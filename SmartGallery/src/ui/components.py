@@ -2,18 +2,35 @@
 
 from __future__ import annotations
 
+from functools import lru_cache
 from typing import Callable
 
 import flet as ft
 from flet import colors
 
+# One shared shape descriptor for every chip; StadiumBorder is a plain style
+# object, so unlike controls it is safe to reuse across parents.
+_CHIP_SHAPE = ft.StadiumBorder()
+
+
+@lru_cache(maxsize=256)
+def _chip_style(label: str) -> tuple[str, str, int]:
+    """Pre-computed ``(text, color, size)`` for a tag chip label.
+
+    Flet controls cannot be shared between parents, so each card still gets
+    its own ``ft.Chip``; this caches the per-tag values fed into it.
+    """
+
+    return (label, colors.ON_PRIMARY_CONTAINER, 11)
+
 
 def tag_chip(label: str) -> ft.Chip:
+    text, color, size = _chip_style(label)
     return ft.Chip(
-        label=ft.Text(label, color=colors.ON_PRIMARY_CONTAINER, size=11),
+        label=ft.Text(text, color=color, size=size),
         bgcolor=colors.SURFACE_VARIANT,
         padding=6,
-        shape=ft.StadiumBorder(),
+        shape=_CHIP_SHAPE,
     )
 
 
@@ -46,14 +63,20 @@ def image_card(
     tags: list[str],
     on_open: Callable[[ft.ControlEvent], None] | None = None,
     on_edit: Callable[[ft.ControlEvent], None] | None = None,
+    data: object = None,
 ) -> ft.Container:
-    """Card layout used in the gallery grid."""
+    """Card layout used in the gallery grid.
+
+    ``data`` is attached to the clickable controls so shared handlers can
+    read it from the event instead of needing a closure per card.
+    """
 
     edit_button = ft.Container(
         content=ft.IconButton(
             icon=ft.icons.EDIT_OUTLINED,
             icon_color=colors.ON_SURFACE_VARIANT,
             tooltip="Edit",
+            data=data,
             on_click=on_edit,
         ),
         alignment=ft.alignment.top_right,
@@ -66,7 +89,7 @@ def image_card(
             width=280,
             height=220,
             fit=ft.ImageFit.COVER,
-            cache_width=300,
+            cache_width=320,
             border_radius=12,
         ),
         border_radius=12,
@@ -75,6 +98,7 @@ def image_card(
     )
 
     return ft.Container(
+        data=data,
         on_click=on_open,
         ink=True,
         border_radius=16,
@@ -2,12 +2,24 @@
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import os
+import threading
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Optional
 
 import flet as ft
 
+try:
+    from PIL import Image
+except ImportError:  # pragma: no cover - thumbnails become a no-op
+    Image = None
+
 from ..ai_engine import AIEngine
+from ..config import settings
 from ..database import Database
 from .components import empty_state, error_snackbar, image_card, info_snackbar
 from .image_details import show_image_editor
@@ -16,6 +28,25 @@ from .image_details import show_image_editor
 class GalleryView(ft.UserControl):
     """Main gallery view with a bottom-friendly layout for mobile."""
 
+    # Completed analyses are written and shown in groups of this size so a
+    # large import refreshes the grid a handful of times, not once per file.
+    _INGEST_BATCH = 8
+
+    # Retyping or backspacing to a recent query should hit a dict, not SQLite.
+    _RESULT_CACHE_MAX = 32
+
+    # Rows fetched per page; more are appended as the grid nears the bottom,
+    # so first paint only builds a screenful of cards instead of hundreds.
+    _PAGE_SIZE = 30
+
+    # Start loading the next page when scrolled within this many pixels of
+    # the end of the grid.
+    _SCROLL_THRESHOLD = 400
+
+    # Cached cards not rendered for this many refreshes are dropped so the
+    # card cache stays bounded on long sessions.
+    _CARD_EVICT_AFTER = 5
+
     def __init__(self, database: Database, ai_engine: AIEngine) -> None:
         super().__init__()
         self.database = database
@@ -27,8 +58,32 @@ class GalleryView(ft.UserControl):
             child_aspect_ratio=0.78,
             spacing=12,
             run_spacing=12,
+            on_scroll=self._handle_scroll,
+        )
+        # Scrollable so the folder tab paginates like the grid; GridView only
+        # reports scroll for the "All photos" tab.
+        self.folder_list = ft.Column(
+            spacing=16,
+            expand=True,
+            scroll=ft.ScrollMode.AUTO,
+            on_scroll=self._handle_scroll,
         )
-        self.folder_list = ft.Column(spacing=16, expand=True)
+        self._search_timer: Optional[threading.Timer] = None
+        # Bounded pool for ingest-time blocking work (DB lookups and writes)
+        # so it never rides on the UI event loop; Database serializes the
+        # shared SQLite connection internally.
+        self._worker_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="ingest")
+        # Built cards keyed by image id so a sort or search refresh reuses
+        # unchanged controls instead of reallocating the whole tree.
+        self._card_cache: Dict[int, ft.Container] = {}
+        self._card_keys: Dict[int, tuple] = {}
+        self._card_last_seen: Dict[int, int] = {}
+        self._refresh_serial = 0
+        self._result_cache: "OrderedDict[tuple, List[dict]]" = OrderedDict()
+        self._images: List[dict] = []
+        self._offset = 0
+        self._exhausted = False
+        self._loading_more = False
         self.file_picker = ft.FilePicker(on_result=self._handle_file_picker_result)
         self.page: Optional[ft.Page] = None
         self.search_field = ft.TextField(
@@ -105,28 +160,94 @@ class GalleryView(ft.UserControl):
         self.refresh_gallery()
 
     def refresh_gallery(self) -> None:
-        images = self._fetch_images()
+        self._refresh_serial += 1
+        self._evict_stale_cards()
+        self._exhausted = False
+        self._images = self._fetch_page(0)
+        self._offset = len(self._images)
         if self.view_tabs.selected_index == 0:
-            self._render_all_images(images)
+            self._render_all_images(self._images)
         else:
-            self._render_folder_groups(images)
+            self._render_folder_groups(self._images)
+        self.update()
+
+    def _handle_scroll(self, event: ft.OnScrollEvent) -> None:
+        if self._exhausted or self._loading_more:
+            return
+        pixels = event.pixels or 0
+        max_extent = event.max_scroll_extent or 0
+        if pixels < max_extent - self._SCROLL_THRESHOLD:
+            return
+
+        self._loading_more = True
+        try:
+            self._append_page()
+        finally:
+            self._loading_more = False
+
+    def _append_page(self) -> None:
+        page_rows = self._fetch_page(self._offset)
+        if not page_rows:
+            return
+
+        self._offset += len(page_rows)
+        self._images.extend(page_rows)
+        if self.view_tabs.selected_index == 0:
+            self.grid.controls.extend(
+                self._card_for(image, image.get("tags", [])) for image in page_rows
+            )
+        else:
+            self._render_folder_groups(self._images)
         self.update()
 
     def _handle_file_picker_result(self, event: ft.FilePickerResultEvent) -> None:
         if not event.files:
             return
 
-        for picked_file in event.files:
-            path = Path(picked_file.path)
-            image_id = self.database.add_image(path)
-            analysis = self.ai_engine.analyze_image(path)
-            self.database.update_image_metadata(
-                image_id=image_id,
-                description=analysis.get("description", ""),
-                processed_flag=True,
+        paths = [Path(picked_file.path) for picked_file in event.files]
+        if self.page:
+            self.page.run_task(self._ingest_files, paths)
+        else:
+            asyncio.run(self._ingest_files(paths))
+
+    async def _ingest_files(self, paths: List[Path]) -> None:
+        """Analyze all picked files concurrently, then store them.
+
+        AI calls are pure I/O waits, so issuing them together collapses the
+        batch wall time to roughly the slowest single request instead of the
+        sum of all of them.
+        """
+
+        # Files that were already analyzed keep their metadata; re-picking
+        # them should not cost another AI round-trip.
+        processed = await self._run_blocking(self.database.get_processed_paths, paths)
+        paths = [path for path in paths if str(path) not in processed]
+        if not paths:
+            if self.page:
+                self.page.snack_bar = info_snackbar("Images already in gallery")
+                self.page.snack_bar.open = True
+                self.page.update()
+            return
+
+        tasks = [asyncio.create_task(self._analyze_one(path)) for path in paths]
+        batch: list[tuple[Path, str, list, str]] = []
+        for future in asyncio.as_completed(tasks):
+            path, analysis, thumb_path = await future
+            batch.append(
+                (
+                    path,
+                    analysis.get("description", ""),
+                    analysis.get("tags", []),
+                    thumb_path,
+                )
             )
-            tag_ids = self.database.upsert_tags(analysis.get("tags", []))
-            self.database.link_tags_to_image(image_id, tag_ids)
+            if len(batch) >= self._INGEST_BATCH:
+                # DB writes block on fsync, so keep them off the event loop.
+                await self._run_blocking(self._write_batch, list(batch))
+                batch.clear()
+                self.refresh_gallery()
+        if batch:
+            await self._run_blocking(self._write_batch, batch)
 
         if self.page:
             self.page.snack_bar = info_snackbar("Images added to gallery")
@@ -134,6 +255,49 @@ class GalleryView(ft.UserControl):
             self.page.update()
         self.refresh_gallery()
 
+    async def _analyze_one(self, path: Path) -> tuple[Path, dict, str]:
+        analysis, thumb_path = await asyncio.gather(
+            self.ai_engine.analyze_image_async(path),
+            self._run_blocking(self._ensure_thumbnail, path),
+        )
+        return path, analysis, thumb_path
+
+    def _ensure_thumbnail(self, path: Path) -> str:
+        """Create (or reuse) a small JPEG preview for a gallery cell.
+
+        The renderer otherwise decodes the full-resolution photo for every
+        card. Returns an empty string when Pillow is unavailable or the file
+        cannot be decoded, in which case the original path is shown.
+        """
+
+        if Image is None:
+            return ""
+
+        try:
+            stat = path.stat()
+            digest = hashlib.blake2b(
+                f"{path}:{stat.st_mtime_ns}".encode(), digest_size=16
+            ).hexdigest()
+            thumb_path = settings.thumbnail_dir / f"{digest}.jpg"
+            if thumb_path.exists():
+                return str(thumb_path)
+
+            with Image.open(path) as original:
+                original.thumbnail((320, 320))
+                original.convert("RGB").save(thumb_path, "JPEG", quality=80)
+            return str(thumb_path)
+        except (OSError, ValueError):
+            return ""
+
+    async def _run_blocking(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(
+            self._worker_pool, func, *args
+        )
+
+    def _write_batch(self, batch: list) -> None:
+        self.database.bulk_ingest(batch)
+        self._result_cache.clear()
+
     def show_error(self, message: str) -> None:
         if self.page:
             self.page.snack_bar = error_snackbar(message)
@@ -141,14 +305,29 @@ class GalleryView(ft.UserControl):
             self.page.update()
 
     def _handle_search_change(self, event: ft.ControlEvent) -> None:
-        self.refresh_gallery()
+        # Debounce so a typing burst triggers one refresh, not one per key.
+        if self._search_timer is not None:
+            self._search_timer.cancel()
+        self._search_timer = threading.Timer(0.25, self.refresh_gallery)
+        self._search_timer.daemon = True
+        self._search_timer.start()
 
     def _handle_sort_change(self, event: ft.ControlEvent) -> None:
         self.refresh_gallery()
 
     def _handle_tab_change(self, event: ft.ControlEvent) -> None:
+        # Both tab bodies stay mounted, and a card control cannot sit in two
+        # parents at once — drop the hidden tab's cards so the cached
+        # instances can reattach to the now-active view.
+        if self.view_tabs.selected_index == 0:
+            self.folder_list.controls = []
+        else:
+            self.grid.controls = []
         self.refresh_gallery()
 
+    def _open_details_event(self, event: ft.ControlEvent) -> None:
+        self._open_details(int(event.control.data))
+
     def _open_details(self, image_id: int) -> None:
         if not self.page:
             return
@@ -156,20 +335,46 @@ class GalleryView(ft.UserControl):
             page=self.page,
             database=self.database,
             image_id=image_id,
-            on_saved=self.refresh_gallery,
+            on_saved=self._on_details_saved,
         )
 
+    def _on_details_saved(self) -> None:
+        self._result_cache.clear()
+        self.refresh_gallery()
+
     def _current_sort_order(self) -> str:
         return "asc" if (self.sort_dropdown.value or "").startswith("asc") else "desc"
 
-    def _fetch_images(self) -> List[dict]:
+    def _fetch_page(self, offset: int) -> List[dict]:
         query = (self.search_field.value or "").strip()
         sort_order = self._current_sort_order()
-        return (
-            self.database.search_images(query=query, limit=200, order=sort_order)
-            if query
-            else self.database.get_images(limit=200, order=sort_order)
-        )
+
+        cache_key = (query, sort_order, offset)
+        images = self._result_cache.get(cache_key)
+        if images is not None:
+            self._result_cache.move_to_end(cache_key)
+        else:
+            if query:
+                images = self.database.search_images(
+                    query=query, limit=self._PAGE_SIZE, offset=offset, order=sort_order
+                )
+                tags_by_id = self.database.get_tags_for_images(
+                    [int(i["id"]) for i in images]
+                )
+                for image in images:
+                    image["tags"] = tags_by_id.get(int(image["id"]), [])
+            else:
+                images = self.database.get_images_with_tags(
+                    limit=self._PAGE_SIZE, offset=offset, order=sort_order
+                )
+            self._result_cache[cache_key] = images
+            if len(self._result_cache) > self._RESULT_CACHE_MAX:
+                self._result_cache.popitem(last=False)
+
+        if len(images) < self._PAGE_SIZE:
+            self._exhausted = True
+        # Copy so callers extending self._images never grow the cached page.
+        return list(images)
 
     def _render_all_images(self, images: List[dict]) -> None:
         if not images:
@@ -178,19 +383,40 @@ class GalleryView(ft.UserControl):
             ]
             return
 
-        cards = []
-        for image in images:
-            tags = self.database.get_tags_for_image(image_id=int(image["id"]))
-            cards.append(
-                image_card(
-                    image_src=str(image["path"]),
-                    description=image.get("description", ""),
-                    tags=tags,
-                    on_open=lambda _, image_id=image["id"]: self._open_details(image_id),
-                    on_edit=lambda _, image_id=image["id"]: self._open_details(image_id),
-                )
-            )
-        self.grid.controls = cards
+        self.grid.controls = [
+            self._card_for(image, image.get("tags", [])) for image in images
+        ]
+
+    def _card_for(self, image: dict, tags: List[str]) -> ft.Container:
+        """Return a cached card for the image, rebuilding only on change."""
+
+        image_id = int(image["id"])
+        self._card_last_seen[image_id] = self._refresh_serial
+        image_src = image.get("thumb_path") or str(image["path"])
+        card_key = (image_src, image.get("description", ""), tuple(tags))
+        cached = self._card_cache.get(image_id)
+        if cached is not None and self._card_keys.get(image_id) == card_key:
+            return cached
+
+        card = image_card(
+            image_src=image_src,
+            description=image.get("description", ""),
+            tags=tags,
+            on_open=self._open_details_event,
+            on_edit=self._open_details_event,
+            data=image_id,
+        )
+        self._card_cache[image_id] = card
+        self._card_keys[image_id] = card_key
+        return card
+
+    def _evict_stale_cards(self) -> None:
+        cutoff = self._refresh_serial - self._CARD_EVICT_AFTER
+        stale = [i for i, seen in self._card_last_seen.items() if seen < cutoff]
+        for image_id in stale:
+            self._card_last_seen.pop(image_id, None)
+            self._card_cache.pop(image_id, None)
+            self._card_keys.pop(image_id, None)
 
     def _render_folder_groups(self, images: List[dict]) -> None:
         if not images:
@@ -199,10 +425,11 @@ class GalleryView(ft.UserControl):
             ]
             return
 
-        grouped: Dict[str, list[dict]] = {}
+        # Plain string slicing instead of a PurePath allocation per row.
+        grouped: Dict[str, list[dict]] = defaultdict(list)
         for image in images:
-            folder_name = Path(image["path"]).parent.name or "Uncategorized"
-            grouped.setdefault(folder_name, []).append(image)
+            folder_name = os.path.basename(os.path.dirname(image["path"])) or "Uncategorized"
+            grouped[folder_name].append(image)
 
         sections: list[ft.Control] = []
         for folder_name in sorted(grouped.keys()):
@@ -211,13 +438,7 @@ class GalleryView(ft.UserControl):
                 spacing=12,
                 run_spacing=12,
                 controls=[
-                    image_card(
-                        image_src=str(img["path"]),
-                        description=img.get("description", ""),
-                        tags=self.database.get_tags_for_image(image_id=int(img["id"])),
-                        on_open=lambda _, image_id=img["id"]: self._open_details(image_id),
-                        on_edit=lambda _, image_id=img["id"]: self._open_details(image_id),
-                    )
+                    self._card_for(img, img.get("tags", []))
                     for img in folder_images
                 ],
             )
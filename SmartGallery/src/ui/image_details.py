@@ -2,13 +2,20 @@
 
 from __future__ import annotations
 
-from typing import Callable, List
+from collections import OrderedDict
+from typing import Callable
 
 import flet as ft
 from flet import colors
 
 from ..database import Database
 
+# Recently opened dialogs keyed by image id; re-opening the same card skips
+# the control-tree rebuild and the details query. Entries are dropped on save
+# so edited metadata is always reloaded.
+_DIALOG_CACHE: "OrderedDict[int, ImageDetailsDialog]" = OrderedDict()
+_DIALOG_CACHE_MAX = 8
+
 
 class ImageDetailsDialog(ft.AlertDialog):
     """Interactive editor for image description and tags."""
@@ -23,7 +30,10 @@ class ImageDetailsDialog(ft.AlertDialog):
         self.database = database
         self.image_id = image_id
         self.on_saved = on_saved
-        self.tags: List[str] = []
+        # Ordered set: O(1) membership and removal while keeping insertion
+        # order for display and save.
+        self.tags: "OrderedDict[str, None]" = OrderedDict()
+        self._chip_by_tag: dict[str, ft.Chip] = {}
 
         self.image = ft.Image(
             fit=ft.ImageFit.CONTAIN,
@@ -50,9 +60,9 @@ class ImageDetailsDialog(ft.AlertDialog):
             on_submit=self._handle_add_tag,
         )
         self.tags_wrap = ft.Wrap(spacing=8, run_spacing=8)
+        self._loaded = False
 
         self._build_layout()
-        self._load_details()
 
     def _build_layout(self) -> None:
         header = ft.Row(
@@ -141,6 +151,8 @@ class ImageDetailsDialog(ft.AlertDialog):
         )
 
     def _load_details(self) -> None:
+        """Fetch and display the image row; safe to run on a worker thread."""
+
         details = self.database.get_image_details(self.image_id)
         if not details:
             self._dismiss(None)
@@ -148,59 +160,90 @@ class ImageDetailsDialog(ft.AlertDialog):
 
         self.image.src = details.get("path", "")
         self.description_field.value = details.get("description", "")
-        self.tags = list(details.get("tags", []))
+        self.tags = OrderedDict((tag, None) for tag in details.get("tags", []))
+        self._loaded = True
         self._refresh_tags()
 
+    def _make_chip(self, tag: str) -> ft.Chip:
+        # One bound handler for every chip; the tag rides along in data
+        # instead of a fresh closure per chip.
+        return ft.Chip(
+            label=ft.Text(tag, color=colors.ON_PRIMARY_CONTAINER, size=11),
+            bgcolor=colors.PRIMARY_CONTAINER,
+            delete_icon=ft.icons.CLOSE,
+            delete_icon_color=colors.ON_PRIMARY_CONTAINER,
+            data=tag,
+            on_delete=self._on_chip_delete,
+            padding=6,
+            shape=ft.StadiumBorder(),
+        )
+
+    def _on_chip_delete(self, event: ft.ControlEvent) -> None:
+        self._remove_tag(event.control.data)
+
+    def _placeholder_chip(self) -> ft.Chip:
+        return ft.Chip(
+            label=ft.Text("No tags yet", color=colors.ON_SURFACE_VARIANT),
+            bgcolor=colors.SURFACE_VARIANT,
+        )
+
     def _refresh_tags(self) -> None:
-        chips: list[ft.Control] = []
-        for tag in self.tags:
-            chips.append(
-                ft.Chip(
-                    label=ft.Text(tag, color=colors.ON_PRIMARY_CONTAINER, size=11),
-                    bgcolor=colors.PRIMARY_CONTAINER,
-                    delete_icon=ft.icons.CLOSE,
-                    delete_icon_color=colors.ON_PRIMARY_CONTAINER,
-                    on_delete=lambda _, t=tag: self._remove_tag(t),
-                    padding=6,
-                    shape=ft.StadiumBorder(),
-                )
-            )
-
-        if not chips:
-            chips.append(
-                ft.Chip(
-                    label=ft.Text("No tags yet", color=colors.ON_SURFACE_VARIANT),
-                    bgcolor=colors.SURFACE_VARIANT,
-                )
-            )
-        self.tags_wrap.controls = chips
+        """Rebuild the whole tag cloud; used for the initial load only.
+
+        Single-tag edits go through :meth:`_handle_add_tag` and
+        :meth:`_remove_tag`, which touch one chip instead of recreating all
+        of them.
+        """
+
+        self._chip_by_tag = {tag: self._make_chip(tag) for tag in self.tags}
+        self.tags_wrap.controls = list(self._chip_by_tag.values()) or [
+            self._placeholder_chip()
+        ]
         if self.page:
             self.update()
 
     def _handle_add_tag(self, event: ft.ControlEvent | None) -> None:
         new_tag = (self.new_tag_field.value or "").strip()
         if new_tag and new_tag not in self.tags:
-            self.tags.append(new_tag)
+            self.tags[new_tag] = None
+            if not self._chip_by_tag:
+                self.tags_wrap.controls.clear()  # drop the placeholder
+            chip = self._make_chip(new_tag)
+            self._chip_by_tag[new_tag] = chip
+            self.tags_wrap.controls.append(chip)
         self.new_tag_field.value = ""
-        self._refresh_tags()
+        if self.page:
+            self.update()
 
     def _remove_tag(self, tag: str) -> None:
-        self.tags = [t for t in self.tags if t != tag]
-        self._refresh_tags()
+        self.tags.pop(tag, None)
+        chip = self._chip_by_tag.pop(tag, None)
+        if chip is not None and chip in self.tags_wrap.controls:
+            self.tags_wrap.controls.remove(chip)
+        if not self._chip_by_tag:
+            self.tags_wrap.controls.append(self._placeholder_chip())
+        if self.page:
+            self.update()
 
     def _handle_save(self, event: ft.ControlEvent | None) -> None:
+        # Snapshot the edits, then write off the UI thread so the renderer
+        # is not blocked on the database round-trips.
         description = (self.description_field.value or "").strip()
-        self.database.update_image_metadata(
-            image_id=self.image_id, description=description, processed_flag=True
-        )
-        self.database.clear_tags(self.image_id)
-        tag_ids = self.database.upsert_tags(self.tags)
-        self.database.link_tags_to_image(self.image_id, tag_ids)
+        tags = list(self.tags)
+        if self.page:
+            self.page.run_thread(self._save_worker, description, tags)
+        else:
+            self._save_worker(description, tags)
+
+    def _save_worker(self, description: str, tags: list[str]) -> None:
+        self.database.save_image_metadata(self.image_id, description, tags)
+
+        _DIALOG_CACHE.pop(self.image_id, None)
 
         if self.on_saved:
             self.on_saved()
 
-        self._dismiss(event)
+        self._dismiss(None)
 
     def _dismiss(self, event: ft.ControlEvent | None) -> None:
         self.open = False
@@ -211,10 +254,24 @@ class ImageDetailsDialog(ft.AlertDialog):
 def show_image_editor(
     page: ft.Page, database: Database, image_id: int, on_saved: Callable[[], None] | None = None
 ) -> ImageDetailsDialog:
-    """Create and display the full-screen dialog."""
+    """Create and display the full-screen dialog, reusing a recent instance."""
+
+    dialog = _DIALOG_CACHE.get(image_id)
+    if dialog is not None:
+        _DIALOG_CACHE.move_to_end(image_id)
+        dialog.on_saved = on_saved
+    else:
+        dialog = ImageDetailsDialog(
+            database=database, image_id=image_id, on_saved=on_saved
+        )
+        _DIALOG_CACHE[image_id] = dialog
+        if len(_DIALOG_CACHE) > _DIALOG_CACHE_MAX:
+            _DIALOG_CACHE.popitem(last=False)
 
-    dialog = ImageDetailsDialog(database=database, image_id=image_id, on_saved=on_saved)
     dialog.open = True
     page.dialog = dialog
     page.update()
+    if not dialog._loaded:
+        # Load off the UI thread; the dialog shell is already visible.
+        page.run_thread(dialog._load_details)
     return dialog